@@ -1,14 +1,16 @@
 from dotenv import load_dotenv
 from typing import Literal
+import aiohttp
+import asyncio
 import requests
 import hashlib
 import hmac
 import time
 import os
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timedelta
 import io
-from tqdm import tqdm
+from tqdm.asyncio import tqdm_asyncio
 
 load_dotenv()
 
@@ -20,6 +22,51 @@ API_KEY = os.getenv('HORUS_API_KEY')
 if not all([BASE_URL, API_KEY]):
     raise ValueError("Missing required environment variables. Please check your .env file.")
 
+MAX_CONCURRENT_REQUESTS = 16  # cap on in-flight requests to respect the API rate limit
+
+LISTING_SEARCH_START = datetime(2017, 1, 1)  # earliest date the listing-date search considers
+
+# Schema of the /market/price CSV; prices stay float64 to keep full precision.
+PRICE_COLUMNS = ("timestamp", "price")
+PRICE_DTYPES = {"timestamp": "int64", "price": "float64"}
+
+HEADERS = {
+    "X-API-KEY": API_KEY,
+    "Accept": "application/json"
+}
+
+
+def _price_params(interval: str, symbol: str, start: int | datetime, end: int | datetime) -> dict:
+    return {
+        "asset": symbol,
+        "interval": interval,
+        "start": start if isinstance(start, int) else int(start.timestamp()),
+        "end": end if isinstance(end, int) else int(end.timestamp()),
+        "format": "csv"
+    }
+
+
+def _parse_price_csv(content: bytes) -> pd.DataFrame:
+    """Parse a /market/price CSV body; an empty body means no data.
+
+    Malformed bodies and schema changes still raise, so callers report them as failures.
+    """
+    try:
+        df = pd.read_csv(
+            io.BytesIO(content),
+            engine="c",
+            usecols=PRICE_COLUMNS,
+            dtype=PRICE_DTYPES,
+            index_col="timestamp"
+        )
+    except pd.errors.EmptyDataError:
+        # e.g. pre-listing days, which the listing-date search probes on purpose
+        return pd.DataFrame()
+    df.index = pd.to_datetime(df.index.to_numpy(), unit="s", cache=True)
+    df.index.name = "timestamp"
+    return df
+
+
 def get_price_data(
         symbol: Literal["BTC","ETH","XRP","BNB","SOL","DOGE","TRX","ADA","XLM","WBTC","SUI","HBAR","LINK","BCH","WBETH","UNI","AVAX","SHIB","TON","LTC","DOT","PEPE","AAVE","ONDO","TAO","WLD","APT","NEAR","ARB","ICP","ETC","FIL","TRUMP","OP","ALGO","POL","BONK","ENA","ENS","VET","SEI","RENDER","FET","ATOM","VIRTUAL","SKY","BNSOL","RAY","TIA","JTO","JUP","QNT","FORM","INJ","STX"], 
         interval: Literal["1d","1h","15m"], 
@@ -27,33 +74,122 @@ def get_price_data(
         end: int | datetime
 ) -> pd.DataFrame:
     try:
-        payload = {
-            "asset": symbol,
-            "interval": interval,
-            "start": start if isinstance(start, int) else int(start.timestamp()),
-            "end": end if isinstance(end, int) else int(end.timestamp()),
-            "format": "csv"
-        }
-        headers = {
-            "X-API-KEY": API_KEY,
-            "Accept": "application/json"
-        }
         r = requests.get(
             BASE_URL + "/market/price",
-            params=payload,
-            headers=headers
+            params=_price_params(interval, symbol, start, end),
+            headers=HEADERS
         )
         r.raise_for_status()
-        df = pd.read_csv(io.StringIO(r.text), index_col='timestamp')
-        df.index = pd.to_datetime(df.index, unit='s')
-        return df
+        return _parse_price_csv(r.content)
     except requests.exceptions.RequestException as e:
         print(f"Error getting price data: {e}")
         return pd.DataFrame()
-    
+
+
+async def fetch_price_data(
+        session: aiohttp.ClientSession,
+        semaphore: asyncio.Semaphore,
+        symbol: str,
+        interval: Literal["1d","1h","15m"],
+        start: int | datetime,
+        end: int | datetime
+) -> tuple[str, pd.DataFrame]:
+    """Async counterpart of get_price_data that shares one session across symbols."""
+    async with semaphore:
+        try:
+            async with session.get(
+                BASE_URL + "/market/price",
+                params=_price_params(interval, symbol, start, end)
+            ) as r:
+                r.raise_for_status()
+                content = await r.read()
+        except aiohttp.ClientError as e:
+            print(f"Error getting price data for {symbol}: {e}")
+            return symbol, pd.DataFrame()
+    return symbol, _parse_price_csv(content)
+
+
+async def _has_daily_price(
+        session: aiohttp.ClientSession,
+        semaphore: asyncio.Semaphore,
+        symbol: str,
+        day: datetime
+) -> bool:
+    async with semaphore:
+        async with session.get(
+            BASE_URL + "/market/price",
+            params=_price_params("1d", symbol, day, day + timedelta(days=1))
+        ) as r:
+            r.raise_for_status()
+            content = await r.read()
+    return not _parse_price_csv(content).empty
+
+
+async def find_listing_date(
+        session: aiohttp.ClientSession,
+        semaphore: asyncio.Semaphore,
+        symbol: str
+) -> datetime:
+    """
+    Binary-search the day ``symbol`` started trading, using one daily candle per probe.
+
+    Returns a date at most one day before the first candle, or LISTING_SEARCH_START
+    if a probe fails so no history is skipped.
+    """
+    lo, hi = LISTING_SEARCH_START, datetime.today()
+    try:
+        while hi - lo > timedelta(days=1):
+            mid = lo + (hi - lo) / 2
+            if await _has_daily_price(session, semaphore, symbol, mid):
+                hi = mid
+            else:
+                lo = mid
+    except aiohttp.ClientError as e:
+        print(f"Error finding listing date for {symbol}: {e}")
+        return LISTING_SEARCH_START
+    return lo
+
+
+async def _fetch_symbol_history(
+        session: aiohttp.ClientSession,
+        semaphore: asyncio.Semaphore,
+        symbol: str,
+        interval: Literal["1d","1h","15m"],
+        start: datetime,
+        end: int | datetime
+) -> tuple[str, pd.DataFrame]:
+    """Find the listing date of ``symbol`` and fetch its history; any failure yields an empty frame."""
+    try:
+        listing = await find_listing_date(session, semaphore, symbol)
+        return await fetch_price_data(session, semaphore, symbol, interval, max(listing, start), end)
+    except Exception as e:
+        print(f"Error fetching history for {symbol}: {e}")
+        return symbol, pd.DataFrame()
+
+
+async def fetch_all_price_data(
+        symbols: list[str],
+        interval: Literal["1d","1h","15m"],
+        start: datetime,
+        end: int | datetime
+) -> dict[str, pd.DataFrame]:
+    """Fetch price history for every symbol concurrently, starting no earlier than its listing date.
+
+    Each symbol runs as its own task, so one failing symbol only leaves its own frame empty.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    async with aiohttp.ClientSession(headers=HEADERS) as session:
+        tasks = [
+            _fetch_symbol_history(session, semaphore, symbol, interval, start, end)
+            for symbol in symbols
+        ]
+        results = await tqdm_asyncio.gather(*tasks)
+    return dict(results)
+
+
 if __name__ == "__main__":
     symbols = ["BTC","ETH","XRP","BNB","SOL","DOGE","TRX","ADA","XLM","WBTC","SUI","HBAR","LINK","BCH","WBETH","UNI","AVAX","SHIB","TON","LTC","DOT","PEPE","AAVE","ONDO","TAO","WLD","APT","NEAR","ARB","ICP","ETC","FIL","TRUMP","OP","ALGO","POL","BONK","ENA","ENS","VET","SEI","RENDER","FET","ATOM","VIRTUAL","SKY","BNSOL","RAY","TIA","JTO","JUP","QNT","FORM","INJ","STX"]
-    for symbol in tqdm(symbols):
-        interval = "1h"
-        df = get_price_data(symbol, interval, datetime(2020,1,1), datetime.today())
+    interval = "1h"
+    frames = asyncio.run(fetch_all_price_data(symbols, interval, datetime(2020,1,1), datetime.today()))
+    for symbol, df in frames.items():
         df.to_csv(f"data/{symbol}_{interval}.csv")
\ No newline at end of file
@@ -2,12 +2,15 @@ from __future__ import annotations
 
 import os
 from datetime import datetime
-from typing import Optional, Dict, Any, List, Union
+from typing import Optional, Dict, Any, List, Tuple, Union
 
+import numpy as np
 import pandas as pd
 import requests
 from dotenv import load_dotenv
 
+from .json_utils import JSONDecodeError, loads
+
 
 class BinanceClient:
     """API client for Binance exchange with focus on historical data."""
@@ -42,8 +45,8 @@ class BinanceClient:
                 params=params
             )
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as exc:
+            return loads(response.content)
+        except (requests.exceptions.RequestException, JSONDecodeError) as exc:
             print(f"Error calling {path}: {exc}")
             return None
 
@@ -69,17 +72,83 @@ class BinanceClient:
         Returns:
             DataFrame with columns: timestamp, open, high, low, close, volume, etc.
         """
+        params = self._klines_params(symbol, interval, start_time, end_time, limit)
+        result = self._request("GET", self.KLINES_PATH, params=params)
+        return self._klines_to_frame(result)
+
+    def get_kline_arrays(
+        self,
+        symbol: str,
+        interval: str,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+        limit: int = 1000
+    ) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Fetch klines as parallel arrays without building a DataFrame.
+
+        Returns:
+            (open_time, high, low, close) as int64/float64 arrays in kline order,
+            or None if the request failed or returned nothing.
+        """
+        params = self._klines_params(symbol, interval, start_time, end_time, limit)
+        result = self._request("GET", self.KLINES_PATH, params=params)
+        if not result:
+            return None
+
+        n = len(result)
+        return (
+            np.fromiter((k[0] for k in result), dtype=np.int64, count=n),
+            np.fromiter((float(k[2]) for k in result), dtype=np.float64, count=n),
+            np.fromiter((float(k[3]) for k in result), dtype=np.float64, count=n),
+            np.fromiter((float(k[4]) for k in result), dtype=np.float64, count=n),
+        )
+
+    def get_latest_kline(
+        self,
+        symbol: str,
+        interval: str,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None
+    ) -> Optional[Tuple[float, float, float, float, float, int]]:
+        """
+        Fetch the newest kline in the window without building a DataFrame.
+
+        Returns:
+            (open, high, low, close, volume, close_time) of the last kline in
+            the window, or None if the request failed or returned nothing.
+        """
+        params = self._klines_params(symbol, interval, start_time, end_time, 1000)
+        result = self._request("GET", self.KLINES_PATH, params=params)
+        if not result:
+            return None
+
+        # Klines come oldest first; a window may hold several (e.g. the one at its start)
+        k = result[-1]
+        return float(k[1]), float(k[2]), float(k[3]), float(k[4]), float(k[5]), int(k[6])
+
+    @staticmethod
+    def _klines_params(
+        symbol: str,
+        interval: str,
+        start_time: Optional[int],
+        end_time: Optional[int],
+        limit: int
+    ) -> Dict[str, Any]:
         params: Dict[str, Any] = {
             "symbol": f"{symbol.upper()}USD",
             "interval": interval,
             "limit": limit
         }
-
-        params["startTime"] = start_time if start_time is not None else None
-        params["endTime"] = end_time if end_time is not None else None
-
-        result = self._request("GET", self.KLINES_PATH, params=params)
-        
+        if start_time is not None:
+            params["startTime"] = start_time
+        if end_time is not None:
+            params["endTime"] = end_time
+        return params
+
+    @staticmethod
+    def _klines_to_frame(result: Optional[List[List[Any]]]) -> pd.DataFrame:
+        """Convert a raw klines payload into a DataFrame indexed by open time."""
         if not result:
             return pd.DataFrame()
 
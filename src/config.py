@@ -3,7 +3,10 @@
 TRADING_FREQUENCY_MS = 5*60*1000  # frequency of trading signals in milliseconds
 SET_TRADE_QUANTITY = 0.01 # fixed trade quantity to place orders once set up(signal found)
 RETRIES = 3  # number of retries for API requests
-BACK_OFF_FACTOR = 2  # exponential backoff factor for retries in seconds
+BASE_DELAY = 1.0  # first retry waits 2 * BASE_DELAY seconds, doubling on every further attempt
+MAX_BACKOFF = 30.0  # upper bound on a single retry wait in seconds
+EXCHANGE_INFO_TTL_S = 300  # how long a fetched exchange info response is reused, in seconds
+USE_HTTP2 = False  # send Roostoo requests over one multiplexed HTTP/2 connection (requires httpx[http2])
 TRADE_INTERVAL = "5m"  # interval for trade data retrieval
 TRADE_COINS = ["XRP", "ZEC", "SOL", "UNI", "HBAR", "PAXG"]
 
@@ -11,10 +11,13 @@ from __future__ import annotations
 
 import csv
 import json
+import os
 import sqlite3
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Iterable, List, Optional, Tuple
+from typing import Iterable, Iterator, List, Optional, Tuple
 
 from .models import Opportunity, PivotPoint, Trade
 from .utils import to_milliseconds
@@ -28,18 +31,68 @@ def _ensure_parent(path: Path) -> None:
 
 
 class SQLiteDataStore:
-    """Very small wrapper around sqlite3 connections."""
+    """Very small wrapper around a single long-lived sqlite3 connection."""
 
     def __init__(self, db_path: str | Path = Path("data/trading.db")) -> None:
         self.db_path = Path(db_path)
         _ensure_parent(self.db_path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid = os.getpid()
+        self._lock = threading.RLock()
+        self._depth = 0
 
     def _connect(self) -> sqlite3.Connection:
-        """Return a live sqlite3 connection."""
+        """Return the shared sqlite3 connection, opening it on first use."""
+
+        # State inherited through fork() must not be reused by the child process.
+        if self._conn_pid != os.getpid():
+            self._conn = None
+            self._conn_pid = os.getpid()
+            self._lock = threading.RLock()
+            self._depth = 0
+
+        with self._lock:
+            if self._conn is None:
+                conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                conn.execute("PRAGMA foreign_keys = ON;")
+                conn.execute("PRAGMA journal_mode = WAL;")
+                conn.execute("PRAGMA synchronous = NORMAL;")
+                conn.execute("PRAGMA temp_store = MEMORY;")
+                self._conn = conn
+            return self._conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run the enclosed reads/writes in one transaction on the shared connection.
+
+        Nested uses join the outermost transaction, which commits on success and
+        rolls back if an exception escapes it. The insert_* helpers only swallow
+        their errors when they run on their own; inside a transaction they re-raise,
+        so a failed insert never leaves a half-written batch to be committed.
+        """
 
-        conn = sqlite3.connect(self.db_path)
-        conn.execute("PRAGMA foreign_keys = ON;")
-        return conn
+        conn = self._connect()
+        with self._lock:
+            self._depth += 1
+            try:
+                yield conn
+            except BaseException:
+                if self._depth == 1:
+                    conn.rollback()
+                raise
+            else:
+                if self._depth == 1:
+                    conn.commit()
+            finally:
+                self._depth -= 1
+
+    def close(self) -> None:
+        """Close the shared connection; the next call reopens it."""
+
+        with self._lock:
+            if self._conn is not None and self._conn_pid == os.getpid():
+                self._conn.close()
+            self._conn = None
 
     def initialize(self) -> None:
         """Create base tables if they do not already exist."""
@@ -75,6 +128,7 @@ class SQLiteDataStore:
             tp_order_ids TEXT NOT NULL,  -- Store list[str] as a JSON string
             entry INTEGER NOT NULL,  -- 0 or 1
             timestamp INTEGER NOT NULL DEFAULT 0,
+            active_idx INTEGER NOT NULL DEFAULT 0,  -- index of the first unfilled TP rung
             PRIMARY KEY (order_id)
         );
         """
@@ -133,7 +187,7 @@ class SQLiteDataStore:
         #             print(f"Successfully executed: {populate.strip()}")
         #         except Exception as e:
         #             print(f"Could not populate datetime column: {e}")
-        with self._connect() as conn:
+        with self.transaction() as conn:
             # try:
             #     conn.execute(
             #     )
@@ -141,6 +195,11 @@ class SQLiteDataStore:
             #     # Column already exists; ignore error.
             #     pass
             conn.executescript(schema)
+            try:
+                conn.execute("ALTER TABLE trades ADD COLUMN active_idx INTEGER NOT NULL DEFAULT 0;")
+            except sqlite3.OperationalError:
+                # Column already exists; ignore error.
+                pass
 
     def fetch_pivots(
         self,
@@ -172,7 +231,7 @@ class SQLiteDataStore:
             + " ORDER BY timestamp ASC"
         )
 
-        with self._connect() as conn:
+        with self.transaction() as conn:
             cursor = conn.execute(query, params)
             rows = cursor.fetchall()
 
@@ -232,7 +291,7 @@ class SQLiteDataStore:
 
         query = " ".join(query_parts)
 
-        with self._connect() as conn:
+        with self.transaction() as conn:
             cursor = conn.execute(query, params)
             rows = cursor.fetchall()
 
@@ -261,12 +320,12 @@ class SQLiteDataStore:
             A list of Trade objects.
         """
         query = (
-            "SELECT coin, order_id, quantity, stop_loss, profit_level, tp_order_ids, entry, timestamp "
+            "SELECT coin, order_id, quantity, stop_loss, profit_level, tp_order_ids, entry, timestamp, active_idx "
             "FROM trades WHERE quantity > 0 "
             "ORDER BY order_id ASC"
         )
 
-        with self._connect() as conn:
+        with self.transaction() as conn:
             cursor = conn.execute(query)
             rows = cursor.fetchall()
 
@@ -281,7 +340,8 @@ class SQLiteDataStore:
                     profit_level=json.loads(row[4]),  # Deserialize JSON to list[float]
                     tp_order_ids=json.loads(row[5]),  # Deserialize JSON to list[str]
                     entry=int(row[6]),
-                    timestamp=int(row[7])
+                    timestamp=int(row[7]),
+                    active_idx=int(row[8]),
                 )
             )
 
@@ -308,8 +368,10 @@ class SQLiteDataStore:
             "price=excluded.price, is_supported=excluded.is_supported"
         )
 
+        nested = False
         try:
-            with self._connect() as conn:
+            with self.transaction() as conn:
+                nested = self._depth > 1
                 for pivot in pivots:
                     # Convert pivot attributes to database-friendly values
                     timestamp = to_milliseconds(getattr(pivot, "timestamp", None))
@@ -332,6 +394,8 @@ class SQLiteDataStore:
 
             return True
         except Exception as e:
+            if nested:
+                raise  # let the enclosing transaction roll back the whole batch
             print(f"Error inserting pivots: {e}")
             return False
 
@@ -362,8 +426,10 @@ class SQLiteDataStore:
             "extrema_timestamp = excluded.extrema_timestamp;"
         )
 
+        nested = False
         try:
-            with self._connect() as conn:
+            with self.transaction() as conn:
+                nested = self._depth > 1
                 for opportunity in opportunities:
                     try:
                         # Convert opportunity attributes to database-friendly values
@@ -398,6 +464,8 @@ class SQLiteDataStore:
 
             return True
         except Exception as e:
+            if nested:
+                raise  # let the enclosing transaction roll back the whole batch
             print(f"Error inserting opportunities: {e}")
             return False
         
@@ -417,8 +485,8 @@ class SQLiteDataStore:
 
         sql = (
             "INSERT INTO trades "
-            "(coin, order_id, quantity, stop_loss, profit_level, tp_order_ids, entry, timestamp) "
-            "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+            "(coin, order_id, quantity, stop_loss, profit_level, tp_order_ids, entry, timestamp, active_idx) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
             "ON CONFLICT(order_id) DO UPDATE SET "
             "coin = excluded.coin, "
             "quantity = excluded.quantity, "
@@ -426,10 +494,13 @@ class SQLiteDataStore:
             "profit_level = excluded.profit_level, "
             "tp_order_ids = excluded.tp_order_ids, "
             "entry = excluded.entry, "
-            "timestamp = excluded.timestamp"
+            "timestamp = excluded.timestamp, "
+            "active_idx = excluded.active_idx"
         )
+        nested = False
         try:
-            with self._connect() as conn:
+            with self.transaction() as conn:
+                nested = self._depth > 1
                 for trade in trades:
                     try:
                         # Convert trade attributes to database-friendly values
@@ -450,12 +521,15 @@ class SQLiteDataStore:
                             profit_level_serialized,
                             tp_order_ids_serialized,
                             trade.entry,
-                            trade.timestamp
+                            trade.timestamp,
+                            trade.active_idx,
                         ),
                     )
 
             return True
         except Exception as e:
+            if nested:
+                raise  # let the enclosing transaction roll back the whole batch
             print(f"Error inserting trades: {e}")
             return False
 
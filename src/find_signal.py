@@ -4,19 +4,19 @@ from datetime import datetime
 from .models import Trade
 from .utils import (
     update_pivots,
+    commit_pivot_scan,
     update_support_resistance,
     to_milliseconds,
-    can_trade
+    can_trade,
+    get_binance_client,
 )
 from .config import TRADING_FREQUENCY_MS, SUPPORT_LINE_TIMEFRAME, TRADE_INTERVAL
-from .datastore import SQLiteDataStore
-from .binance import BinanceClient
+from .datastore import db
 
 
-def findSignal(coin: str, executeTime: int, trend: str, amount_precision: int, price_precision: int) -> None:
-    db = SQLiteDataStore()
-    db.initialize()
-    datasource = BinanceClient()
+def findSignal(coin: str, executeTime: int, trend: str, amount_precision: int, price_precision: int) -> int:
+    """Scan ``coin`` for setups, place any resulting orders and return how many trades were opened."""
+    datasource = get_binance_client()
     execute_ms = to_milliseconds(executeTime)
     if execute_ms is None:
         raise ValueError("Execution time must be numeric and positive")
@@ -35,7 +35,7 @@ def findSignal(coin: str, executeTime: int, trend: str, amount_precision: int, p
 
 
     coin_start_ms = execute_ms - TRADING_FREQUENCY_MS * 25
-    coin_data = datasource.get_historical_klines(
+    coin_klines = datasource.get_kline_arrays(
         symbol=coin,
         interval=TRADE_INTERVAL,
         start_time=coin_start_ms,
@@ -44,14 +44,21 @@ def findSignal(coin: str, executeTime: int, trend: str, amount_precision: int, p
     )
 
     if trend != "volatile":
-        update_pivots(coin_data, pivots)
+        if coin_klines is not None:
+            timestamps, highs, lows, _ = coin_klines
+            update_pivots(highs, lows, timestamps, pivots, scan_key=coin)
         update_support_resistance(pivots, opportunities)
         can_trade(coin, pivots, opportunities, trades, trend, amount_precision, price_precision)
-        db.insert_pivots(coin, pivots)
-        db.insert_opportunities(coin, opportunities)
-        db.insert_trades(trades)
+        with db.transaction():
+            db.insert_pivots(coin, pivots)
+            db.insert_opportunities(coin, opportunities)
+            db.insert_trades(trades)
+        # Reached only if the inserts committed: inside the transaction they raise
+        # instead of returning False, so a failed store leaves the candles to rescan.
+        commit_pivot_scan(coin)
 
     print(f"Found {len(pivots)} pivots and {len(opportunities)} opportunities for {coin}")
+    return len(trades)
 
 current_time = datetime.now()
 print(f"Current time: {current_time}")
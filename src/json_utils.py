@@ -0,0 +1,17 @@
+"""JSON decoding shared by the exchange clients."""
+
+from __future__ import annotations
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Both decoders accept the raw response bytes, so callers never build a str first.
+loads = orjson.loads if orjson is not None else json.loads
+
+# Raised by ``loads`` on a malformed body. Both variants subclass ValueError, not
+# requests' RequestException, so callers must catch this alongside transport errors.
+JSONDecodeError = orjson.JSONDecodeError if orjson is not None else json.JSONDecodeError
@@ -5,8 +5,10 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Dict, Any, Optional, Literal
 
+import numpy as np
 
-@dataclass
+
+@dataclass(slots=True)
 class PivotPoint:
     """A pivot/fractal point in price time-series.
 
@@ -22,7 +24,28 @@ class PivotPoint:
     type: Literal["high", "low"]
     is_supported: Optional[bool] = False
 
-@dataclass
+@dataclass(slots=True)
+class PivotSeries:
+    """Structure-of-arrays snapshot of a pivot list, for vectorized scans.
+
+    Row ``i`` describes ``pivots[i]``; a missing price is stored as NaN.
+    """
+    timestamps: np.ndarray  # int64
+    prices: np.ndarray  # float64
+    is_low: np.ndarray  # bool, False for 'high'
+    is_supported: np.ndarray  # bool
+
+    @classmethod
+    def from_pivots(cls, pivots: list[PivotPoint]) -> PivotSeries:
+        n = len(pivots)
+        return cls(
+            timestamps=np.fromiter((p.timestamp for p in pivots), dtype=np.int64, count=n),
+            prices=np.fromiter((np.nan if p.price is None else p.price for p in pivots), dtype=np.float64, count=n),
+            is_low=np.fromiter((p.type == "low" for p in pivots), dtype=bool, count=n),
+            is_supported=np.fromiter((bool(p.is_supported) for p in pivots), dtype=bool, count=n),
+        )
+
+@dataclass(slots=True)
 class Opportunity:
     """Simplified opportunity window bound to pivot extremes."""
     support_line: float
@@ -34,7 +57,7 @@ class Opportunity:
     start: Optional[int] = None
     end: Optional[int] = None
 
-@dataclass
+@dataclass(slots=True)
 class Trade:
     coin: str
     order_id: int
@@ -44,3 +67,4 @@ class Trade:
     profit_level: list[float]
     tp_order_ids: list[str]
     timestamp: int
+    active_idx: int = 0  # first TP/SL rung that is still live; rung lists are never mutated
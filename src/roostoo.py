@@ -1,14 +1,103 @@
 from __future__ import annotations
 
-import hashlib
+import asyncio
+import functools
 import hmac
+import logging
 import os
+import random
 import time
-from typing import Any, Dict, Optional
-from .config import RETRIES, BACK_OFF_FACTOR
+from decimal import Decimal
+from typing import Any, Dict, Optional, Tuple
+from .config import RETRIES, BASE_DELAY, MAX_BACKOFF, EXCHANGE_INFO_TTL_S, USE_HTTP2
+from .json_utils import JSONDecodeError, loads
+import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+logger = logging.getLogger(__name__)
+
+# Exceptions _request handles, for whichever HTTP library backs the session.
+# A body that is not valid JSON is retried like a transport error, as it was when
+# response.json() raised requests' own JSONDecodeError.
+_HTTP_STATUS_ERRORS: Tuple[type[Exception], ...] = (requests.exceptions.HTTPError,)
+_TRANSPORT_ERRORS: Tuple[type[Exception], ...] = (requests.exceptions.RequestException, JSONDecodeError)
+if httpx is not None:
+    _HTTP_STATUS_ERRORS += (httpx.HTTPStatusError,)
+    _TRANSPORT_ERRORS += (httpx.RequestError,)
+
+# Signed parameters of each private endpoint, pre-sorted the way the signature expects.
+_KEY_ORDER: Dict[str, tuple[str, ...]] = {
+    "/v3/balance": ("timestamp",),
+    "/v3/pending_count": ("timestamp",),
+    "/v3/place_order": ("pair", "price", "quantity", "side", "timestamp", "type"),
+    "/v3/cancel_order": ("order_id", "pair", "timestamp"),
+    "/v3/query_order": ("order_id", "pair", "pending_only", "timestamp"),
+}
+
+# Every endpoint the client calls; their full URLs are built once per client.
+_ENDPOINTS = (
+    "/v3/serverTime",
+    "/v3/exchangeInfo",
+    "/v3/ticker",
+    "/v3/balance",
+    "/v3/place_order",
+    "/v3/cancel_order",
+    "/v3/query_order",
+    "/v3/pending_count",
+)
+
+# Pre-encoded signed keys, so only the values are encoded per request.
+_KEY_BYTES: Dict[str, bytes] = {k: k.encode("utf-8") for keys in _KEY_ORDER.values() for k in keys}
+
+
+def _decimal_str(value: float) -> str:
+    """Plain (non-exponent) decimal text for a quantity or price.
+
+    Goes through str() so the value is sent exactly as before, only without the
+    exponent form str() uses for very small or large floats; nothing is rounded.
+    """
+    return format(Decimal(str(value)), "f")
+
+
+@functools.lru_cache(maxsize=1)
+def _env_config() -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """Load .env and resolve (base_url, api_key, secret) once per process."""
+    load_dotenv()
+    return (
+        os.getenv("ROOSTOO_BASE_URL"),
+        os.getenv("ROOSTOO_TEST_API_KEY"),
+        os.getenv("ROOSTOO_TEST_SECRET_KEY"),
+    )
+
+
+class ExponentialBackoff:
+    """Retry policy for RoostooClient: exponential backoff with jitter, capped at ``max_backoff``."""
+
+    __slots__ = ("retries", "base_delay", "max_backoff")
+
+    def __init__(self, retries: int = RETRIES, base_delay: float = BASE_DELAY,
+                 max_backoff: float = MAX_BACKOFF) -> None:
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_backoff = max_backoff
+
+    def wait(self, retry: int, retry_after: Optional[str] = None) -> float:
+        """Seconds to wait before attempt ``retry``; a server Retry-After header wins.
+
+        Otherwise the exponential delay gets up to 50% random jitter so concurrent
+        workers that hit a 429 together do not all retry at the same instant.
+        """
+        if retry_after is not None:
+            return int(retry_after)
+        return min(self.max_backoff, self.base_delay * (1 << retry) * (1 + random.random() * 0.5))
+
 
 class RoostooClient:
     """Thin API client for the Roostoo mock exchange."""
@@ -18,80 +107,134 @@ class RoostooClient:
         base_url: Optional[str] = None,
         api_key: Optional[str] = None,
         secret: Optional[str] = None,
+        session: Optional[requests.Session] = None,
+        retry: bool = True,
     ) -> None:
-        load_dotenv()
+        env_base_url, env_api_key, env_secret = _env_config()
 
-        self.base_url = base_url or os.getenv("ROOSTOO_BASE_URL")
-        self.api_key = api_key or os.getenv("ROOSTOO_TEST_API_KEY")
-        self.secret = secret or os.getenv("ROOSTOO_TEST_SECRET_KEY")
+        self.base_url = base_url or env_base_url
+        self.api_key = api_key or env_api_key
+        self.secret = secret or env_secret
 
         if not all([self.base_url, self.api_key, self.secret]):
             raise ValueError("Missing required environment variables. Please check your .env file.")
 
-        self.retry = 0
+        self.secret_bytes = self.secret.encode("utf-8")
+        self._url_cache = {path: self.base_url + path for path in _ENDPOINTS}
+        self.session = session or self._create_session()
+        # None makes _request fail fast on the first error
+        self.retry_policy: Optional[ExponentialBackoff] = ExponentialBackoff() if retry else None
+        self._exchange_info_cache: Optional[Tuple[Dict[str, Any], float]] = None  # (response, expires_at)
+        self._last_signature: Optional[Tuple[tuple, str]] = None  # ((path, payload items), signature)
+
+    @staticmethod
+    def _create_session() -> requests.Session:
+        """Session with a keep-alive pool; retries are handled by _request, not urllib3.
+
+        With USE_HTTP2 set (and httpx installed) an httpx client is used instead, so
+        concurrent calls are multiplexed over one HTTP/2 connection.
+        """
+        if USE_HTTP2:
+            if httpx is None:
+                raise ImportError("USE_HTTP2 requires httpx; install it with `pip install httpx[http2]`.")
+            return httpx.Client(http2=True, timeout=5.0, headers={"Accept": "application/json"})
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({"Accept": "application/json"})
+        return session
 
     def _request(self, method: str, path: str, *, params: Optional[Dict[str, Any]] = None,
                 data: Optional[Dict[str, Any]] = None, auth: bool = False) -> Optional[Dict[str, Any]]:
-        url = f"{self.base_url}{path}"
+        url = self._url_cache.get(path) or self.base_url + path
         payload = params if params is not None else data
-        headers = {}
-
-        if auth and payload is not None:
-            signature = self._generate_signature(payload)
-            headers = {
-                "RST-API-KEY": self.api_key,
-                "MSG-SIGNATURE": signature,
-            }
+        headers = self._signed_headers(payload, path, auth)
 
+        policy = self.retry_policy
+        attempts = policy.retries if policy is not None else 1
         retry = 0
-        while retry < RETRIES:
+        while retry < attempts:
             try:
-                response = requests.request(
+                response = self.session.request(
                     method=method,
                     url=url,
                     params=params,
                     data=data,
-                    headers=headers if headers else None,
+                    headers=headers,
                 )
                 response.raise_for_status()  # Raise exception for HTTP errors (4xx, 5xx)
 
-                # Log and return successful response
-                if not path == "/v3/exchangeInfo":
-                    print(f"Status: {response.status_code}, Response: {response.text}")
-                return response.json()
-
-            except requests.exceptions.HTTPError as exc:
-                # Handle 429 Too Many Requests
-                if exc.response.status_code == 429:
-                    retry += 1
-                    retry_after = int(exc.response.headers.get("Retry-After", 1))  # Use Retry-After if provided
-                    wait_time = BACK_OFF_FACTOR ** retry if "Retry-After" not in exc.response.headers else retry_after
-                    print(f"Rate limit exceeded (429). Retrying in {wait_time} seconds... (Attempt {retry}/{RETRIES})")
-                    time.sleep(wait_time)
-                else:
-                    # Log and re-raise for non-retryable HTTP errors
-                    print(f"HTTPError: {exc}. No retry for status {exc.response.status_code}.")
-                    break
-
-            except requests.exceptions.RequestException as exc:
-                # Handle generic request errors with retries
-                retry += 1
-                wait_time = BACK_OFF_FACTOR ** retry
-                print(f"RequestException: {exc}. Retrying in {wait_time} seconds... (Attempt {retry}/{RETRIES})")
-                time.sleep(wait_time)
+                # Log and return successful response; the body is only decoded when debug logging is on
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Status: %s, Response: %s", response.status_code, response.text)
+                return loads(response.content)
+
+            except _HTTP_STATUS_ERRORS as exc:
+                error, status, retry_after = exc, exc.response.status_code, exc.response.headers.get("Retry-After")
+            except _TRANSPORT_ERRORS as exc:
+                error, status, retry_after = exc, None, None
+
+            retry += 1
+            wait_time = self._retry_wait(error, status, retry_after, retry, attempts)
+            if wait_time is None:
+                break
+            time.sleep(wait_time)
 
         print("Max retries reached. Returning None.")
         return None
 
-    def _generate_signature(self, params: Dict[str, Any]) -> str:
-        query_string = "&".join([f"{k}={params[k]}" for k in sorted(params.keys())])
-        secret_bytes = self.secret.encode("utf-8")
-        message = query_string.encode("utf-8")
-        return hmac.new(secret_bytes, message, hashlib.sha256).hexdigest()
+    def _retry_wait(self, error: Exception, status: Optional[int], retry_after: Optional[str],
+                    retry: int, attempts: int) -> Optional[float]:
+        """Seconds to wait before attempt ``retry`` after ``error``, or None to give up.
+
+        ``status`` is the HTTP status of a rejected response and None for transport or
+        decoding errors; only 429s and those are retried. Shared by both transports.
+        """
+        if status is not None and status != 429:
+            print(f"HTTPError: {error}. No retry for status {status}.")
+            return None
+        policy = self.retry_policy
+        if policy is None:
+            return None
+        wait_time = policy.wait(retry, retry_after)
+        if status == 429:
+            print(f"Rate limit exceeded (429). Retrying in {wait_time:.1f} seconds... (Attempt {retry}/{attempts})")
+        else:
+            print(f"RequestException: {error}. Retrying in {wait_time:.1f} seconds... (Attempt {retry}/{attempts})")
+        return wait_time
+
+    def _signed_headers(self, payload: Optional[Dict[str, Any]], path: str, auth: bool) -> Dict[str, str]:
+        if not auth or payload is None:
+            return {}
+        # Identical payloads (same timestamp) within one millisecond reuse the last HMAC
+        key = (path, tuple(payload.items()))
+        last = self._last_signature
+        if last is not None and last[0] == key:
+            signature = last[1]
+        else:
+            signature = self._generate_signature(payload, path)
+            self._last_signature = (key, signature)
+        return {
+            "RST-API-KEY": self.api_key,
+            "MSG-SIGNATURE": signature,
+        }
+
+    def _generate_signature(self, params: Dict[str, Any], path: Optional[str] = None) -> str:
+        order = _KEY_ORDER.get(path)
+        keys = [k for k in order if k in params] if order is not None else None
+        if keys is None or len(keys) != len(params):
+            keys = sorted(params)  # unknown endpoint or unexpected parameter
+        message = b"&".join([
+            b"%s=%s" % (_KEY_BYTES.get(k) or k.encode("utf-8"), str(params[k]).encode("utf-8"))
+            for k in keys
+        ])
+        return hmac.digest(self.secret_bytes, message, "sha256").hex()
 
     @staticmethod
     def _timestamp_ms() -> int:
-        return int(time.time() * 1000)
+        return time.time_ns() // 1_000_000
 
     # Public endpoints -------------------------------------------------
 
@@ -99,7 +242,22 @@ class RoostooClient:
         return self._request("GET", "/v3/serverTime")
 
     def get_exchange_info(self) -> Optional[Dict[str, Any]]:
-        return self._request("GET", "/v3/exchangeInfo")
+        """Return exchange info, reusing a successful response for EXCHANGE_INFO_TTL_S seconds."""
+        cached = self._cached_exchange_info()
+        if cached is not None:
+            return cached
+        return self._store_exchange_info(self._request("GET", "/v3/exchangeInfo"))
+
+    def _cached_exchange_info(self) -> Optional[Dict[str, Any]]:
+        cached = self._exchange_info_cache
+        if cached is not None and time.monotonic() < cached[1]:
+            return cached[0]
+        return None
+
+    def _store_exchange_info(self, info: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        if info is not None:
+            self._exchange_info_cache = (info, time.monotonic() + EXCHANGE_INFO_TTL_S)
+        return info
 
     def get_ticker(self, pair: Optional[str] = None) -> Optional[Dict[str, Any]]:
         params: Dict[str, Any] = {"timestamp": self._timestamp_ms()}
@@ -119,7 +277,8 @@ class RoostooClient:
             "timestamp": self._timestamp_ms(),
             "pair": f"{coin}/USD",
             "side": side,
-            "quantity": qty,
+            # Formatted once here so signing and form encoding both reuse the same string
+            "quantity": _decimal_str(qty),
         }
 
         if order_type:
@@ -129,7 +288,7 @@ class RoostooClient:
         else:
             payload["type"] = "LIMIT"
         if price is not None:
-            payload["price"] = price
+            payload["price"] = _decimal_str(price)
 
         return self._request("POST", "/v3/place_order", data=payload, auth=True)
 
@@ -156,11 +315,105 @@ class RoostooClient:
             payload["pending_only"] = pending_only
         return self._request("POST", "/v3/query_order", data=payload, auth=True)
 
+    def query_order_status(self, order_id: int) -> Optional[str]:
+        """Return only the ``Status`` of a single order, or None if it cannot be read."""
+        return self._order_status(self.query_order(order_id=order_id))
+
+    @staticmethod
+    def _order_status(order: Optional[Dict[str, Any]]) -> Optional[str]:
+        try:
+            return order["OrderMatched"][0]["Status"]
+        except (TypeError, KeyError, IndexError):
+            return None
+
     def pending_count(self) -> Optional[Dict[str, Any]]:
         params = {"timestamp": self._timestamp_ms()}
         return self._request("GET", "/v3/pending_count", params=params, auth=True)
 
 
+class AsyncRoostooClient(RoostooClient):
+    """Asyncio variant of RoostooClient backed by one aiohttp session.
+
+    Every endpoint method keeps its RoostooClient signature but returns an
+    awaitable, so independent calls can be overlapped with ``asyncio.gather``::
+
+        async with AsyncRoostooClient() as client:
+            tickers = await client.multi_ticker(["BTC/USD", "ETH/USD"])
+    """
+
+    MAX_CONNECTIONS = 16
+
+    @staticmethod
+    def _create_session() -> None:
+        # aiohttp sessions must be created inside the running event loop.
+        return None
+
+    async def __aenter__(self) -> "AsyncRoostooClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def _session(self) -> aiohttp.ClientSession:
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                headers={"Accept": "application/json"},
+                connector=aiohttp.TCPConnector(limit=self.MAX_CONNECTIONS),
+            )
+        return self.session
+
+    async def _request(self, method: str, path: str, *, params: Optional[Dict[str, Any]] = None,
+                       data: Optional[Dict[str, Any]] = None, auth: bool = False) -> Optional[Dict[str, Any]]:
+        url = self._url_cache.get(path) or self.base_url + path
+        payload = params if params is not None else data
+        headers = self._signed_headers(payload, path, auth)
+        session = self._session()
+
+        policy = self.retry_policy
+        attempts = policy.retries if policy is not None else 1
+        retry = 0
+        while retry < attempts:
+            try:
+                async with session.request(method, url, params=params, data=data, headers=headers) as response:
+                    response.raise_for_status()
+                    content = await response.read()
+                return loads(content)
+
+            except aiohttp.ClientResponseError as exc:
+                error, status = exc, exc.status
+                retry_after = exc.headers.get("Retry-After") if exc.headers else None
+            except (aiohttp.ClientError, JSONDecodeError) as exc:
+                error, status, retry_after = exc, None, None
+
+            retry += 1
+            wait_time = self._retry_wait(error, status, retry_after, retry, attempts)
+            if wait_time is None:
+                break
+            await asyncio.sleep(wait_time)
+
+        print("Max retries reached. Returning None.")
+        return None
+
+    async def get_exchange_info(self) -> Optional[Dict[str, Any]]:
+        cached = self._cached_exchange_info()
+        if cached is not None:
+            return cached
+        return self._store_exchange_info(await self._request("GET", "/v3/exchangeInfo"))
+
+    async def query_order_status(self, order_id: int) -> Optional[str]:
+        return self._order_status(await self.query_order(order_id=order_id))
+
+    async def multi_ticker(self, pairs: list[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Fetch the ticker of every pair concurrently over the shared connection pool."""
+        results = await asyncio.gather(*(self.get_ticker(pair) for pair in pairs))
+        return dict(zip(pairs, results))
+
+
 if __name__ == "__main__":
     client = RoostooClient()
     client.get_server_time()
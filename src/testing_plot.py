@@ -11,10 +11,26 @@ import mplfinance as mpf
 from tqdm import tqdm
 from talib import ATR
 from scipy.signal import find_peaks
+from matplotlib.collections import PolyCollection
 
 def plot_local_extremes(ts,degree=2):
     pass
 
+def peak_bands(ax, prices, points, buffer, color, span=24*5):
+    """Draw a +/- buffer band around every peak as a single collection instead of one axhspan each."""
+    levels = prices[points]
+    ymin, ymax = levels - buffer, levels + buffer
+    # Like axhspan, x is in axes fraction and y in data coordinates
+    xmin = np.clip((points - span) / len(prices), 0, 1)
+    xmax = np.clip((points + span) / len(prices), 0, 1)
+    verts = np.stack([
+        np.column_stack([xmin, ymin]),
+        np.column_stack([xmin, ymax]),
+        np.column_stack([xmax, ymax]),
+        np.column_stack([xmax, ymin]),
+    ], axis=1)
+    ax.add_collection(PolyCollection(verts, transform=ax.get_yaxis_transform(), facecolor=color, alpha=0.3))
+
 if __name__ == "__main__":
     ts = pd.read_csv('data/BTC_1d.csv', index_col='timestamp')
     ts.index = pd.to_datetime(ts.index)
@@ -22,27 +38,29 @@ if __name__ == "__main__":
     ts = ts.loc['2025-01-01':]
     lts = np.log(ts)
 
+    vol = lts['price'].diff().std()
+    buffer = vol * 0.5
+
+    # Detect peaks once on the whole series, then bucket them by month below
+    filled = lts['price'].fillna(0).to_numpy()
+    all_max_points = find_peaks(filled, threshold=buffer)[0]
+    all_min_points = find_peaks(-filled, threshold=buffer)[0]
+    months = lts.index.month.to_numpy()
+
     for m, g in tqdm(lts.groupby(lts.index.month)):
-        vol = lts['price'].diff().std()
 
         #min_point = g['low'].idxmin()
         #max_point = g['high'].idxmax()
 
         ax = g['price'].plot()
-        buffer = vol * 0.5
-
-
-        max_points = find_peaks(g['price'].fillna(0), threshold=buffer)[0]
-        min_points = find_peaks(-g['price'].fillna(0), threshold=buffer)[0]
-        for i in max_points:
-            top_line = g['price'].iat[i]
-            top_range = (top_line - buffer, top_line + buffer)
-            ax.axhspan(ymin=top_range[0], ymax=top_range[1], xmin=max(0,(i-24*5)/len(g)), xmax=min(1,(i+24*5)/len(g)), color='green', alpha=0.3)
 
-        for i in min_points:
-            bot_line = g['price'].iat[i]
-            bot_range = (bot_line - buffer, bot_line + buffer)
-            ax.axhspan(ymin=bot_range[0], ymax=bot_range[1], xmin=max(0,(i-24*5)/len(g)), xmax=min(1,(i+24*5)/len(g)), color='red', alpha=0.3)
+        # Map global peak positions to positions within this month's group
+        positions = np.flatnonzero(months == m)
+        max_points = np.searchsorted(positions, all_max_points[months[all_max_points] == m])
+        min_points = np.searchsorted(positions, all_min_points[months[all_min_points] == m])
+        prices = g['price'].to_numpy()
+        peak_bands(ax, prices, max_points, buffer, 'green')
+        peak_bands(ax, prices, min_points, buffer, 'red')
 
         #mpf.plot(lts,type='candle')
         plt.show()
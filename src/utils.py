@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+import functools
+import os
 from datetime import datetime
+from operator import attrgetter
 from typing import Any
 from .roostoo import RoostooClient
 from .binance import BinanceClient
+import numpy as np
 import pandas as pd
+from numba import njit
 
-from .models import PivotPoint, Opportunity, Trade
+from .models import PivotPoint, PivotSeries, Opportunity, Trade
 from .config import (
     MAXIMUM_PERCENTAGE_DIFFERENCE,
     MINIMUM_BREAKTHROUGH_PERCENTAGE,
@@ -18,19 +23,92 @@ from .config import (
     TRADING_FREQUENCY_MS
 )
 
+# Trend names indexed by 1 + sign(sma_short - sma_long)
+_TRENDS = ("bearish", "volatile", "bullish")
+
+# Multiplier on the support line a low pivot must fall under to count as a breakthrough
+_BREAKTHROUGH_FACTOR = 1.0 - float(MINIMUM_BREAKTHROUGH_PERCENTAGE)
+
+
+@functools.lru_cache(maxsize=1)
+def get_binance_client() -> BinanceClient:
+    """Process-wide BinanceClient shared by the signal and owned-coin handlers."""
+    return BinanceClient()
+
+
+@functools.lru_cache(maxsize=1)
+def get_roostoo_client() -> RoostooClient:
+    """Process-wide RoostooClient shared by the signal and owned-coin handlers."""
+    # Created on first use so importing this module does not require the .env credentials.
+    return RoostooClient()
+
+
+# A forked pool worker must not reuse the parent's clients: their pooled keep-alive
+# sockets would be shared between processes and interleave responses. (Windows has
+# no fork, and spawned workers start with empty caches.)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=get_binance_client.cache_clear)
+    os.register_at_fork(after_in_child=get_roostoo_client.cache_clear)
+
+
+def _timestamp_to_ms(value: pd.Timestamp) -> int:
+    return int(value.value // 1_000_000)
+
+
+def _datetime_to_ms(value: datetime) -> int | None:
+    ts = value.timestamp()
+    return int(ts * 1000) if ts > 0 else None
+
+
+def _numeric_to_ms(numeric: int | float) -> int | None:
+    """Epoch seconds or milliseconds to milliseconds; values from 1e12 up are already ms."""
+    if numeric <= 0:
+        return None
+    if numeric >= 1_000_000_000_000:
+        return int(numeric)
+    return int(numeric * 1000)
+
+
+def _str_to_ms(value: str) -> int | None:
+    try:
+        numeric = float(value)
+    except ValueError:
+        return _iso_to_milliseconds(value)
+    return _numeric_to_ms(numeric)
+
+
+# Handlers for the other exact types to_milliseconds usually sees; int is inlined
+# in to_milliseconds and bool is deliberately absent
+_MS_HANDLERS = {
+    pd.Timestamp: _timestamp_to_ms,
+    datetime: _datetime_to_ms,
+    float: _numeric_to_ms,
+    str: _str_to_ms,
+}
+
 
 def to_milliseconds(value: Any) -> int | None:
     """Normalize assorted timestamp-like inputs to epoch milliseconds."""
 
+    # Epoch ints (pivot/opportunity timestamps) are the common case
+    if type(value) is int:
+        if value <= 0:
+            return None
+        return value if value >= 1_000_000_000_000 else value * 1000
+
+    handler = _MS_HANDLERS.get(type(value))
+    if handler is not None:
+        return handler(value)
+
+    # Generic path for None, bool, subclasses and other timestamp-like objects
     if value is None or isinstance(value, bool):
         return None
 
     if isinstance(value, pd.Timestamp):
-        return int(value.value // 1_000_000)
+        return _timestamp_to_ms(value)
 
     if isinstance(value, datetime):
-        ts = value.timestamp()
-        return int(ts * 1000) if ts > 0 else None
+        return _datetime_to_ms(value)
 
     if hasattr(value, "timestamp"):
         try:
@@ -43,75 +121,145 @@ def to_milliseconds(value: Any) -> int | None:
     try:
         numeric = float(value)
     except (TypeError, ValueError):
-        text = str(value).strip()
-        if not text:
-            return None
-        if text.endswith("Z"):
-            text = text[:-1] + "+00:00"
-        try:
-            dt = datetime.fromisoformat(text)
-        except ValueError:
-            return None
-        ts = dt.timestamp()
-        return int(ts * 1000) if ts > 0 else None
+        return _iso_to_milliseconds(str(value))
+    return _numeric_to_ms(numeric)
 
-    if numeric <= 0:
+
+@functools.lru_cache(maxsize=4096)
+def _iso_to_milliseconds(text: str) -> int | None:
+    """Parse an ISO-8601 string to epoch milliseconds; memoized since the same strings recur."""
+    text = text.strip()
+    if not text:
         return None
-    if numeric >= 1_000_000_000_000:
-        return int(numeric)
-    return int(numeric * 1000)
+    if text.endswith("Z"):
+        text = text[:-1] + "+00:00"
+    try:
+        dt = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    ts = dt.timestamp()
+    return int(ts * 1000) if ts > 0 else None
 
 
 def check_trend_conditions(execute_ms: int) -> str:
     """Return trend classification from SMA(20) and SMA(50) on closing prices."""
     
-    datasource = BinanceClient()
+    datasource = get_binance_client()
     btc_start_ms = execute_ms - TRADING_FREQUENCY_MS * 50
-    btc_data = datasource.get_historical_klines(
+    btc_klines = datasource.get_kline_arrays(
         symbol="BTC",
         interval=TRADE_INTERVAL,
         start_time=btc_start_ms,
         end_time=execute_ms,
         limit=50,
     )
-    
-    # print(f"btc_data length: {len(btc_data)}")
-    # print("btc_data details:")
-    # print(btc_data)
-    
-    if "close" not in btc_data.columns:
+    if btc_klines is None:
         return "volatile"
 
-    closes = btc_data.sort_index()["close"].dropna()
+    _, _, _, closes = btc_klines
     short_window = 20
     long_window = 50
 
     if closes.size < long_window:
         return "volatile"
 
-    sma_short = closes.tail(short_window).mean()
-    sma_long = closes.tail(long_window).mean()
+    tail = closes[-long_window:]
+    sma_long = tail.sum() / long_window
+    sma_short = tail[-short_window:].sum() / short_window
 
-    if sma_short > sma_long:
-        return "bullish"
-    if sma_short < sma_long:
-        return "bearish"
-    return "volatile"
+    return _TRENDS[1 + (sma_short > sma_long) - (sma_short < sma_long)]
 
 
-def update_pivots(data: pd.DataFrame, pivots: list[PivotPoint]):
-    """Detect new pivot highs/lows since the most recent stored pivot and append them."""
+# Name of each _scan_pivots code
+_PIVOT_KINDS = ("none", "high", "low", "both")
+
+# Timestamp of the last candle update_pivots classified, per scan_key, in this process.
+# A scan is only staged in _PENDING_SCAN until commit_pivot_scan confirms its pivots were
+# stored, so a cycle that fails before the insert rescans those candles next time.
+_SCANNED_THROUGH: dict[str, int] = {}
+_PENDING_SCAN: dict[str, int] = {}
 
-    if data is None or data.empty:
-        return "none"
+
+@njit(cache=True, nogil=True)
+def _rolling_max(values: np.ndarray, span: int, out: np.ndarray) -> None:
+    """Write max(values[k:k + span]) to out[k] for every full window.
+
+    Uses a monotonic deque of indices (a ring buffer of ``span`` slots), so each
+    value is pushed and popped at most once: O(N) instead of O(N * span).
+    """
+    deque = np.empty(span, dtype=np.int64)
+    head = 0
+    size = 0
+    for i in range(values.size):
+        # Drop the front index once it slides out of the window
+        if size and deque[head] <= i - span:
+            head = (head + 1) % span
+            size -= 1
+        # Drop back indices that can no longer be the maximum
+        while size and values[deque[(head + size - 1) % span]] <= values[i]:
+            size -= 1
+        deque[(head + size) % span] = i
+        size += 1
+        if i >= span - 1:
+            out[i - span + 1] = values[deque[head]]
+
+
+@njit(cache=True, nogil=True)
+def _scan_pivots(
+    highs: np.ndarray, lows: np.ndarray, timestamps: np.ndarray,
+    start: int, end: int, window: int, last_high_ts: int, last_low_ts: int,
+) -> np.ndarray:
+    """Flag new candidates start..end: bit 1 marks a pivot high, bit 2 a pivot low.
+
+    A candidate is a pivot high/low when no neighbour within ``window`` candles
+    has a higher high/lower low, i.e. it equals the centred rolling max/min.
+    It is only flagged when it is newer than the last stored pivot of that type.
+    """
+    span = 2 * window + 1
+    count = end - start + 1
+    rolling_max = np.empty(count, dtype=np.float64)
+    neg_rolling_min = np.empty(count, dtype=np.float64)
+    # Window k covers candles start+k-window .. start+k+window, centred on candidate start+k
+    _rolling_max(highs[start - window:end + window + 1], span, rolling_max)
+    _rolling_max(-lows[start - window:end + window + 1], span, neg_rolling_min)
+
+    piv = np.empty(count, dtype=np.int8)
+    for k in range(count):
+        ts = timestamps[start + k]
+        pivot_high = highs[start + k] >= rolling_max[k] and ts > last_high_ts
+        pivot_low = -lows[start + k] >= neg_rolling_min[k] and ts > last_low_ts
+        piv[k] = pivot_high + 2 * pivot_low
+    return piv
+
+
+def update_pivots(
+    highs: np.ndarray, lows: np.ndarray, timestamps: np.ndarray, pivots: list[PivotPoint],
+    scan_key: str | None = None,
+):
+    """Detect new pivot highs/lows since the most recent stored pivot and append them.
+
+    ``highs``, ``lows`` and ``timestamps`` are parallel per-candle arrays (see
+    BinanceClient.get_kline_arrays). With a ``scan_key`` (e.g. the coin), candles
+    already classified by an earlier call with the same key in this process are
+    skipped, once the caller has stored that call's pivots and called
+    commit_pivot_scan(scan_key). Returns the new pivot kind found on the last
+    scanned candle: "none", "high", "low" or "both".
+    """
+
+    if scan_key is not None:
+        # A scan that was never committed must not be committed along with this one
+        _PENDING_SCAN.pop(scan_key, None)
 
     window = max(int(PIVOT_POINT_COMPARE), 1)
-    if len(data) < (window * 2 + 1):
+    if len(timestamps) < (window * 2 + 1):
         return "none"
 
-    df = data.sort_index()
-    if not {"high", "low"}.issubset(df.columns):
-        return "none"
+    highs = np.asarray(highs, dtype=np.float64)
+    lows = np.asarray(lows, dtype=np.float64)
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    if (np.diff(timestamps) < 0).any():
+        order = np.argsort(timestamps, kind="stable")
+        highs, lows, timestamps = highs[order], lows[order], timestamps[order]
 
     latest_threshold: int | None = None
     if pivots:
@@ -122,74 +270,79 @@ def update_pivots(data: pd.DataFrame, pivots: list[PivotPoint]):
         if latest_ts > 0:
             latest_threshold = latest_ts - (2 * 15 * 60 * 1000)
 
-    filtered_indices = []
-    timestamps = [idx for idx in df.index]
-    for idx, ts in enumerate(timestamps):
-        if latest_threshold is None or ts >= latest_threshold:
-            filtered_indices.append(idx)
-
-    if not filtered_indices:
+    # The timestamps are sorted, so the first candle at or after the threshold is a binary search away
+    first_index = 0 if latest_threshold is None else int(np.searchsorted(timestamps, latest_threshold, side="left"))
+    scanned_through = _SCANNED_THROUGH.get(scan_key) if scan_key is not None else None
+    if scanned_through is not None:
+        # A candle is final once ``window`` newer candles exist, so earlier results still hold
+        first_index = max(first_index, int(np.searchsorted(timestamps, scanned_through, side="right")))
+    if first_index >= len(timestamps):
         return "none"
 
-    start = max(filtered_indices[0], window)
-    end = len(df) - window - 1
+    start = max(first_index, window)
+    end = len(timestamps) - window - 1
     if start > end:
         return "none"
+    if scan_key is not None:
+        _PENDING_SCAN[scan_key] = int(timestamps[end])
 
+    # Stored pivots are never re-emitted; a default of 0 also rules out unset (<= 0) timestamps
+    last_high_ts = max((p.timestamp for p in pivots if p.type == "high"), default=0)
+    last_low_ts = max((p.timestamp for p in pivots if p.type == "low"), default=0)
+    piv = _scan_pivots(highs, lows, timestamps, start, end, window, int(last_high_ts), int(last_low_ts))
+    stored = len(pivots)
 
-    for candidate in range(start, end + 1):
-        pivot_low = True
-        pivot_high = True
+    for offset in np.flatnonzero(piv):
+        candidate = start + int(offset)
+        pivot_high = bool(piv[offset] & 1)
+        pivot_low = bool(piv[offset] & 2)
 
-        for neighbor in range(candidate - window, candidate + window + 1):
-            row_candidate = df.iloc[candidate]
-            row_neighbor = df.iloc[neighbor]
-            if row_candidate["low"] > row_neighbor["low"]:
-                pivot_low = False
-            if row_candidate["high"] < row_neighbor["high"]:
-                pivot_high = False
-
-            if not pivot_low and not pivot_high:
-                break
-
-        timestamp_ms = timestamps[candidate]
-        if timestamp_ms <= 0:
-            continue
+        timestamp_ms = int(timestamps[candidate])
         if pivot_low:
-            exists = any(
-                p.timestamp == timestamp_ms and p.type == "low"
-                for p in pivots
-            )
-            if not exists:
-                pivots.append(
-                    PivotPoint(
-                        timestamp=timestamp_ms,
-                        price=float(df.iloc[candidate]["low"]),
-                        position=candidate,
-                        type="low",
-                        is_supported=False,
-                    )
+            pivots.append(
+                PivotPoint(
+                    timestamp=timestamp_ms,
+                    price=float(lows[candidate]),
+                    position=candidate,
+                    type="low",
+                    is_supported=False,
                 )
+            )
 
         if pivot_high:
-            exists = any(
-                p.timestamp == timestamp_ms and p.type == "high"
-                for p in pivots
-            )
-            if not exists:
-                pivots.append(
-                    PivotPoint(
-                        timestamp=timestamp_ms,
-                        price=float(df.iloc[candidate]["high"]),
-                        position=candidate,
-                        type="high",
-                        is_supported=False,
-                    )
+            pivots.append(
+                PivotPoint(
+                    timestamp=timestamp_ms,
+                    price=float(highs[candidate]),
+                    position=candidate,
+                    type="high",
+                    is_supported=False,
                 )
+            )
+
+    # Keep pivots in timestamp order; new pivots are already ordered among themselves, so
+    # only the join with the stored ones can be out of order (the scan overlaps the last pivot)
+    if 0 < stored < len(pivots) and pivots[stored].timestamp < pivots[stored - 1].timestamp:
+        pivots.sort(key=attrgetter("timestamp"))
+
+    return _PIVOT_KINDS[int(piv[-1])]
+
+
+def commit_pivot_scan(scan_key: str) -> None:
+    """Skip the candles of the last update_pivots call for ``scan_key`` from now on.
+
+    Call only after the pivots it found have been persisted.
+    """
+    scanned_through = _PENDING_SCAN.pop(scan_key, None)
+    if scanned_through is not None:
+        _SCANNED_THROUGH[scan_key] = scanned_through
 
 
 def update_support_resistance(pivots: list[PivotPoint], opportunities: list[Opportunity]):
-    """Identify a support or resistance line and enqueue a new opportunity."""
+    """Identify a support or resistance line and enqueue a new opportunity.
+
+    ``pivots`` must be in timestamp order, as fetch_pivots and update_pivots leave them.
+    """
 
     if len(pivots) < 2:
         return None
@@ -198,51 +351,65 @@ def update_support_resistance(pivots: list[PivotPoint], opportunities: list[Oppo
     # Define both target types (support and resistance)
     target_types = ["low", "high"]
 
+    series = PivotSeries.from_pivots(pivots)
+    type_masks = {"low": series.is_low, "high": ~series.is_low}
+
     for target_type in target_types:
-        for i in range(len(pivots) - 1):
-            # Skip invalid or already used pivots
-            if pivots[i].type != target_type or pivots[i].price is None or pivots[i].is_supported:
+        # Only consecutive pivots of the same type can form a line, so pair each
+        # pivot with the next one of its type; every other pair is non consecutive
+        positions = np.flatnonzero(type_masks[target_type])
+        if positions.size < 2:
+            continue
+
+        # Evaluate every consecutive pair at once; a missing price is NaN, which fails every comparison
+        timestamps = series.timestamps[positions]
+        prices = series.prices[positions]
+        supported = series.is_supported[positions]
+        base_prices = prices[:-1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            diff_pct = np.abs(np.diff(prices)) / base_prices
+        valid = (
+            ~supported[:-1]
+            & ~supported[1:]
+            & (base_prices != 0)
+            & (np.diff(timestamps) <= SUPPORT_LINE_TIMEFRAME)
+            & (diff_pct <= MAXIMUM_PERCENTAGE_DIFFERENCE)
+        )
+
+        for k in np.flatnonzero(valid):
+            first, second = pivots[positions[k]], pivots[positions[k + 1]]
+            # A pair accepted in this loop can use up the next pair's first pivot
+            if first.is_supported or second.is_supported:
                 continue
 
-            for j in range(i + 1, len(pivots)):
-                # Skip invalid or already used pivots
-                if pivots[j].type != target_type or pivots[j].price is None or pivots[j].is_supported:
-                    continue
-                
-                # Skip non consecutive part
-                if any(pivots[k].type == target_type for k in range(i+1,j)):
-                    continue  
-                
-                # Check if pivots are within the timeframe limit
-                time_gap = abs(pivots[j].timestamp - pivots[i].timestamp)
-                if time_gap > SUPPORT_LINE_TIMEFRAME:
-                    break
-
-                # Check price difference tolerance
-                base_price = float(pivots[i].price)
-                if base_price == 0:
-                    continue
-
-                diff_pct = abs(pivots[j].price - pivots[i].price) / base_price
-                if diff_pct > MAXIMUM_PERCENTAGE_DIFFERENCE:
-                    continue
-
-                # A valid support/resistance line is found
-                pivots[i].is_supported = True
-                pivots[j].is_supported = True
-
-                support_price = (pivots[i].price + pivots[j].price) / 2.0
-                new_opportunity = Opportunity(
-                    support_line=support_price,
-                    minimum=0.0,
-                    maximum=0.0,
-                    relative_pivot=0.0,
-                    action="N/A",
-                    start=pivots[j].timestamp,
-                    end=pivots[j].timestamp + SUPPORT_LINE_TIMEFRAME,
-                    extrema_timestamp=0
-                )
-                opportunities.append(new_opportunity)
+            # A valid support/resistance line is found
+            first.is_supported = True
+            second.is_supported = True
+
+            support_price = (first.price + second.price) / 2.0
+            new_opportunity = Opportunity(
+                support_line=support_price,
+                minimum=0.0,
+                maximum=0.0,
+                relative_pivot=0.0,
+                action="N/A",
+                start=second.timestamp,
+                end=second.timestamp + SUPPORT_LINE_TIMEFRAME,
+                extrema_timestamp=0
+            )
+            opportunities.append(new_opportunity)
+
+def _first_index(mask: np.ndarray, lo: int) -> int:
+    """Index of the first True in ``mask[lo:]``, or -1."""
+    if lo >= mask.size:
+        return -1
+    k = lo + int(np.argmax(mask[lo:]))
+    return k if mask[k] else -1
+
+def _last_index(mask: np.ndarray, lo: int, hi: int) -> int:
+    """Index of the last True in ``mask[lo:hi + 1]``, or -1."""
+    hits = np.flatnonzero(mask[lo:hi + 1])
+    return lo + int(hits[-1]) if hits.size else -1
 
 def can_trade(
     coin: str,pivots: list[PivotPoint], opportunities: list[Opportunity],
@@ -259,30 +426,45 @@ def can_trade(
     """
     if not pivots or not opportunities or trend not in ["bullish", "bearish"]:
         return
-    roostoo_client = RoostooClient()  # Initialize the Roostoo client
+    roostoo_client = get_roostoo_client()  # Shared Roostoo client for this process
+    series = PivotSeries.from_pivots(pivots)
+    prices, timestamps = series.prices, series.timestamps
+    # Index of the nearest pivot high strictly before each pivot, -1 when there is none
+    prev_high = np.full(len(pivots), -1, dtype=np.int64)
+    prev_high[1:] = np.maximum.accumulate(np.where(series.is_low, -1, np.arange(len(pivots))))[:-1]
     for opportunity in opportunities:
         if opportunity.action != "N/A":
             continue
 
         if trend == "bullish":
-            # Find the pivot high (relative_pivot)
-            for i in range(len(pivots)):
-                if pivots[i].timestamp < opportunity.start or pivots[i].timestamp < opportunity.extrema_timestamp:
-                    continue
-                if opportunity.minimum == 0 and pivots[i].type == "low" and pivots[i].price < opportunity.support_line * (1 - MINIMUM_BREAKTHROUGH_PERCENTAGE):
-                    opportunity.minimum = pivots[i].price
+            # Low pivots that break through the support line, evaluated for all pivots at once
+            breaks = series.is_low & check_minimum_conditions_batch(prices, timestamps, opportunity)
+            # Pivots are in timestamp order, so the scan window is a suffix of the arrays
+            begin = int(np.searchsorted(
+                timestamps, max(opportunity.start, opportunity.extrema_timestamp), side="left"
+            ))
+
+            # The first breakthrough sets the minimum and takes the pivot high before it as relative_pivot
+            if opportunity.minimum == 0:
+                first = _first_index(breaks, begin)
+                if first >= 0:
+                    opportunity.minimum = float(prices[first])
                     opportunity.end += TIME_EXTEND_MS
-                    opportunity.extrema_timestamp = pivots[i].timestamp
-                    for j in range(i-1, -1, -1):
-                        if pivots[j].type == "high":
-                            opportunity.relative_pivot = pivots[j].price
-                            break
-                if opportunity.minimum != 0 and pivots[i].type == "low" and pivots[i].price < opportunity.support_line * (1 - MINIMUM_BREAKTHROUGH_PERCENTAGE):
-                    opportunity.minimum = pivots[i].price
-                    opportunity.extrema_timestamp = pivots[i].timestamp
-                if opportunity.minimum > 0 and pivots[i].price > opportunity.relative_pivot:
-                    opportunity.maximum = pivots[i].price
-                    break
+                    opportunity.extrema_timestamp = int(timestamps[first])
+                    if prev_high[first] >= 0:
+                        opportunity.relative_pivot = float(prices[prev_high[first]])
+                    begin = first
+
+            # The first pivot above relative_pivot sets the maximum; until then (inclusive)
+            # the minimum follows the most recent breakthrough
+            if opportunity.minimum > 0:
+                above = _first_index(prices > opportunity.relative_pivot, begin)
+                latest = _last_index(breaks, begin, above if above >= 0 else len(prices) - 1)
+                if latest >= 0:
+                    opportunity.minimum = float(prices[latest])
+                    opportunity.extrema_timestamp = int(timestamps[latest])
+                if above >= 0:
+                    opportunity.maximum = float(prices[above])
         
         # elif trend == "bearish":
         #     # Find the pivot low (relative_pivot)
@@ -349,29 +531,29 @@ def can_trade(
         else:
             opportunity.action = "N/A"
 
-# def check_minimum_conditions(pivot: PivotPoint, opportunity: Opportunity) -> bool:
-#     """Check if minimum conditions after breaking through support are met"""
-#     # require a low pivot
-#     if pivot.type != "low":
-#         return False
+def _minimum_threshold(opportunity: Opportunity) -> float:
+    """Price a low pivot must fall under to break through the opportunity's support line."""
+    return opportunity.support_line * _BREAKTHROUGH_FACTOR
 
-#     # ensure timestamps fall inside opportunity window when provided
-#     if getattr(opportunity, "start", None) is not None and pivot.timestamp < opportunity.start:
-#         return False
+def check_minimum_conditions(pivot: PivotPoint, opportunity: Opportunity) -> bool:
+    """Check if minimum conditions after breaking through support are met"""
+    # require a low pivot; the batch check leaves the pivot type to its callers
+    if pivot.type != "low":
+        return False
 
+    prices = np.array([pivot.price], dtype=np.float64)
+    timestamps = np.array([pivot.timestamp], dtype=np.int64)
+    return bool(check_minimum_conditions_batch(prices, timestamps, opportunity)[0])
 
-#     # threshold: pivot must be lower than avg by the configured percentage
-#     try:
-#         pct = float(MINIMUM_BREAKTHROUGH_PERCENTAGE)
-#     except Exception:
-#         return False
-    
-#     avg = opportunity.support_line
-#     threshold = avg * (1.0 - pct)
-#     if pivot.price >= threshold:
-#         return False
+def check_minimum_conditions_batch(prices: np.ndarray, timestamps: np.ndarray, opportunity: Opportunity) -> np.ndarray:
+    """Vectorized check_minimum_conditions for pivot price/timestamp arrays.
 
-#     return True
+    The pivot type is not known here, so callers AND the result with their own low-pivot mask.
+    """
+    mask = prices < _minimum_threshold(opportunity)
+    if opportunity.start is not None:
+        mask &= timestamps >= opportunity.start
+    return mask
 
 # def check_maximum_conditions(pivot: PivotPoint, opportunity: Opportunity) -> bool:
 #     """Check if maximum conditions after breaking out the previous high are met"""
@@ -0,0 +1,55 @@
+import sqlite3
+
+import numpy as np
+import pytest
+
+from src import find_signal, utils
+from src.config import TRADING_FREQUENCY_MS
+from src.datastore import SQLiteDataStore
+
+
+class _FakeBinance:
+    def __init__(self, klines):
+        self.klines = klines
+
+    def get_kline_arrays(self, **kwargs):
+        return self.klines
+
+
+def _peak_klines(n=25, peak=10, start_ms=1_700_000_000_000):
+    """Candles whose only pivot is a high at ``peak``."""
+    timestamps = start_ms + np.arange(n, dtype=np.int64) * TRADING_FREQUENCY_MS
+    highs = 100.0 - np.abs(np.arange(n) - peak)
+    lows = highs - 1.0
+    return timestamps, highs, lows, highs - 0.5
+
+
+def test_failed_pivot_insert_keeps_scan_bookmark(tmp_path, monkeypatch):
+    store = SQLiteDataStore(tmp_path / "trading.db")
+    store.initialize()
+    with store.transaction() as conn:
+        conn.execute(
+            "CREATE TRIGGER fail_pivots BEFORE INSERT ON pivots "
+            "BEGIN SELECT RAISE(ABORT, 'pivots unavailable'); END;"
+        )
+
+    klines = _peak_klines()
+    execute_ms = int(klines[0][-1]) + TRADING_FREQUENCY_MS
+    monkeypatch.setattr(find_signal, "db", store)
+    monkeypatch.setattr(find_signal, "get_binance_client", lambda: _FakeBinance(klines))
+    monkeypatch.setattr(find_signal, "can_trade", lambda *args, **kwargs: None)
+    monkeypatch.setattr(utils, "_SCANNED_THROUGH", {})
+    monkeypatch.setattr(utils, "_PENDING_SCAN", {})
+
+    with pytest.raises(sqlite3.IntegrityError):
+        find_signal.findSignal("BTC", execute_ms, "bullish", 2, 2)
+    assert "BTC" not in utils._SCANNED_THROUGH
+
+    # Once storing works again the same candles are rescanned and the pivot is kept
+    with store.transaction() as conn:
+        conn.execute("DROP TRIGGER fail_pivots")
+    find_signal.findSignal("BTC", execute_ms, "bullish", 2, 2)
+
+    stored = store.fetch_pivots("BTC", since=int(klines[0][0]), until=execute_ms)
+    assert [(p.timestamp, p.type) for p in stored] == [(int(klines[0][10]), "high")]
+    assert "BTC" in utils._SCANNED_THROUGH